@@ -1,24 +1,29 @@
+import importlib
 import subprocess
 import sys
-import time
+import tempfile
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 import click
-import tomlkit
-from mdstream import MarkdownStream
-from rich import print
-from rich.traceback import Traceback
-
-from pyproject_pip.create import create_project
-from pyproject_pip.pypip import (
-    find_and_sort,
-    get_package_info,
-    get_requirements_packages,
-    modify_pyproject_toml,
-    modify_requirements,
-    name_and_version,
-)
+
+# rich, mdstream, tomlkit and requests are imported inside the commands that need them,
+# so `pypip --help` and shell completion do not pay for them.
+
+
+@contextmanager
+def _prefetch_pyproject():
+    """Parse pyproject.toml in the background while the body runs pip.
+
+    load_pyproject caches the parse, so the pyproject update after pip finishes reuses it.
+    """
+    from pyproject_pip.pypip import load_pyproject
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(load_pyproject)
+        yield
 
 
 @click.group(invoke_without_command=True)
@@ -74,34 +79,72 @@ def install_command(
         hatch_env (str, optional): The Hatch environment to use. Defaults to "default".
         dependency_group (str, optional): The dependency group to use. Defaults to "dependencies".
     """
+    from packaging.utils import canonicalize_name
+
+    from pyproject_pip.pypip import (
+        base_name,
+        get_requirements_packages,
+        installed_version,
+        is_bare_requirement,
+        modify_pyproject_toml_bulk,
+        modify_requirements_bulk,
+        name_and_version,
+        pip_supports_report,
+        read_pip_report,
+        run_pip,
+    )
+
     try:
         if requirements:
             if not Path(requirements).exists():
                 click.echo(f"Requirements file {requirements} not found. Creating it.")
                 Path(requirements).touch()
             packages = get_requirements_packages(requirements)
+        if not packages:
+            return
 
-        for package in packages:
-            package_install_cmd = [sys.executable, "-m", "pip", "install"]
-            if editable:
-                package_install_cmd.append("-e")
+        with _prefetch_pyproject(), tempfile.TemporaryDirectory() as report_dir:
+            # Install everything in a single pip invocation so pip starts and resolves only once.
+            # On upgrade, have pip report what it installed instead of asking PyPI afterwards.
+            report_path = Path(report_dir) / "report.json"
+            package_install_cmd = ["install"]
             if upgrade:
+                if pip_supports_report():
+                    package_install_cmd += ["--report", str(report_path)]
                 package_install_cmd.append("-U")
-            package_install_cmd.append(package)
-            subprocess.check_call(package_install_cmd)
-
-            package_name, package_version = name_and_version(package, upgrade=upgrade)
-            modify_pyproject_toml(
-                package,
-                package_version,
-                action="install",
-                hatch_env=hatch_env,
-                dependency_group=dependency_group,
-            )
-            modify_requirements(package_name, package_version, action="install")
+            for package in packages:
+                if editable:
+                    package_install_cmd.append("-e")
+                package_install_cmd.append(package)
+            run_pip(package_install_cmd)
+            installed = read_pip_report(report_path) if upgrade else {}
+
+        resolved = [name_and_version(package) for package in packages]
+        if upgrade:
+
+            def upgraded_version(package_name):
+                # Only bare names get a pin; a spec with its own specifier, marker or URL is recorded as given.
+                if not is_bare_requirement(package_name):
+                    return None
+                name = base_name(package_name)
+                # Packages pip left untouched are not in the report (nor is anything on pip < 22.2),
+                # so fall back to the version that is actually installed.
+                return installed.get(canonicalize_name(name)) or installed_version(name)
+
+            importlib.invalidate_caches()
+            resolved = [(package_name, version or upgraded_version(package_name)) for package_name, version in resolved]
+
+        # Apply every change in memory and write each file once.
+        modify_pyproject_toml_bulk(
+            resolved,
+            action="install",
+            hatch_env=hatch_env,
+            dependency_group=dependency_group,
+        )
+        modify_requirements_bulk(resolved, action="install")
 
     except subprocess.CalledProcessError as e:
-        click.echo(f"Error: Failed to install {package}.", err=True)
+        click.echo(f"Error: Failed to install {', '.join(packages)}.", err=True)
         click.echo(f"Reason: {e}", err=True)
         sys.exit(e.returncode)
 
@@ -123,32 +166,48 @@ def uninstall_command(packages, hatch_env, dependency_group) -> None:
         hatch_env (str, optional): The Hatch environment to use. Defaults to "default".
         dependency_group (str, optional): The dependency group to use. Defaults to "dependencies".
     """
-    for package in packages:
-        package_name = package.split("==")[0].split("[")[0]  # Handle extras
-
-        try:
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "uninstall", package_name, "-y"],
-            )
-            modify_requirements(package_name, action="uninstall")
-            modify_pyproject_toml(
-                package_name,
-                action="uninstall",
-                hatch_env=hatch_env,
-                dependency_group=dependency_group,
-            )
-            click.echo(f"Successfully uninstalled {package_name}")
-        except subprocess.CalledProcessError as e:
-            click.echo(f"Error: Failed to uninstall {package_name}.", err=True)
-            click.echo(f"Reason: {e}", err=True)
-            sys.exit(e.returncode)
-        except Exception as e:
-            click.echo(
-                f"Unexpected error occurred while trying to uninstall {package_name}:",
-                err=True,
-            )
-            print(Traceback.from_exception(e))
-            sys.exit(1)
+    from rich import print
+    from rich.traceback import Traceback
+
+    from pyproject_pip.pypip import (
+        base_name,
+        modify_pyproject_toml_bulk,
+        modify_requirements_bulk,
+        run_pip,
+    )
+
+    # Specs that are not a plain name (VCS URLs, paths) are passed through for pip to report on.
+    package_names = [base_name(package) for package in packages]
+    if not package_names:
+        return
+    try:
+        with _prefetch_pyproject():
+            # One pip invocation for every package instead of one per package.
+            run_pip(["uninstall", "-y", *package_names])
+    except subprocess.CalledProcessError as e:
+        click.echo(f"Error: Failed to uninstall {', '.join(package_names)}.", err=True)
+        click.echo(f"Reason: {e}", err=True)
+        sys.exit(e.returncode)
+
+    try:
+        # Apply every change in memory and write each file once.
+        removed = [(package_name, None) for package_name in package_names]
+        modify_requirements_bulk(removed, action="uninstall")
+        modify_pyproject_toml_bulk(
+            removed,
+            action="uninstall",
+            hatch_env=hatch_env,
+            dependency_group=dependency_group,
+        )
+    except Exception as e:
+        click.echo(
+            f"Unexpected error occurred while trying to uninstall {', '.join(package_names)}:",
+            err=True,
+        )
+        print(Traceback.from_exception(e))
+        sys.exit(1)
+    for package_name in package_names:
+        click.echo(f"Successfully uninstalled {package_name}")
 
 
 @cli.command("show")
@@ -159,28 +218,34 @@ def show_command(hatch_env) -> None:
     Args:
         hatch_env (str, optional): The Hatch environment to use. Defaults to "default".
     """
+    from pyproject_pip.pypip import read_project_dependencies, read_pyproject
+
     try:
-        with Path("pyproject.toml").open() as f:
-            content = f.read()
-            pyproject = tomlkit.parse(content)
-
-        # Determine if we are using Hatch or defaulting to project dependencies
-        if "tool" in pyproject and "hatch" in pyproject["tool"] and hatch_env is not None:
-            dependencies = (
-                pyproject.get("tool", {}).get("hatch", {}).get("envs", {}).get(hatch_env, {}).get("dependencies", [])
-            )
-        else:
-            dependencies = pyproject.get("project", {}).get("dependencies", [])
+        # Plain [project] dependencies can be read straight from the file without a full parse.
+        dependencies = read_project_dependencies() if hatch_env is None else None
+        if dependencies is None:
+            pyproject = read_pyproject()
+
+            # Determine if we are using Hatch or defaulting to project dependencies
+            if "tool" in pyproject and "hatch" in pyproject["tool"] and hatch_env is not None:
+                dependencies = (
+                    pyproject.get("tool", {})
+                    .get("hatch", {})
+                    .get("envs", {})
+                    .get(hatch_env, {})
+                    .get("dependencies", [])
+                )
+            else:
+                dependencies = pyproject.get("project", {}).get("dependencies", [])
 
         if dependencies:
-            click.echo("Dependencies:")
-            for dep in dependencies:
-                click.echo(f"  {dep}")
-    except FileNotFoundError:
-        print(Traceback.from_exception(FileNotFoundError))
+            click.echo("Dependencies:\n" + "\n".join(f"  {dep}" for dep in dependencies))
+    except FileNotFoundError as e:
+        import rich
+        from rich.traceback import Traceback
+
+        rich.print(Traceback.from_exception(type(e), e, e.__traceback__))
         sys.exit(1)
-    finally:
-        sys.exit(0)
 
 
 @cli.command("find")
@@ -195,48 +260,29 @@ def find_command(package, limit, sort) -> None:
         limit (int, optional): Limit the number of results. Defaults to 5.
         sort (str, optional): Sort key to use. Defaults to "downloads".
     """
-    try:
-        packages = find_and_sort(package, limit, sort)
-        md = MarkdownStream()
-        md.update("# Packages found:")
-        for p in packages:
-            md.update(f"## {p['name']}")
-            md.update(f"**Version:** {p['version']}")
-            md.update(f"**Downloads:** {p['downloads']}")
-            md.update(f"**Summary:** {p['summary']}")
-            md.update(f"**URLs:** {p.get('urls', '')}")
-            md.update("---", final=True)
-        time.sleep(2)
-    except Exception as e:
-        traceback.print_exc()
+    from mdstream import MarkdownStream
 
-@cli.command("search") # Alias for find
-@click.argument("package")
-@click.option("--limit", default=5, help="Limit the number of results")
-@click.option("--sort", default="downloads", help="Sort key to use")
-def search_command(package, limit, sort) -> None:
-    """Find a package on PyPI and optionally sort the results.
+    from pyproject_pip.pypip import find_and_sort
 
-    Args:
-        package (str): The package to search for.
-        limit (int, optional): Limit the number of results. Defaults to 5.
-        sort (str, optional): Sort key to use. Defaults to "downloads".
-    """  # noqa: D205
     try:
         packages = find_and_sort(package, limit, sort)
-        md = MarkdownStream()
-        md.update("# Packages found:")
+        # Render everything in one final update; MarkdownStream stops after its first final update.
+        lines = ["# Packages found:"]
         for p in packages:
-            md.update(f"## {p['name']}")
-            md.update(f"**Version:** {p['version']}")
-            md.update(f"**Downloads:** {p['downloads']}")
-            md.update(f"**Summary:** {p['summary']}")
-            md.update(f"**URLs:** {p.get('urls', '')}")
-            md.update("---", final=True)
-            time.sleep(2)
+            lines.append(f"## {p['name']}")
+            lines.append(f"**Version:** {p['version']}")
+            lines.append(f"**Downloads:** {p['downloads']}")
+            lines.append(f"**Summary:** {p['summary']}")
+            lines.append(f"**URLs:** {p.get('urls', '')}")
+            lines.append("---")
+        MarkdownStream().update("\n".join(lines), final=True)
     except Exception as e:
         traceback.print_exc()
 
+
+cli.add_command(find_command, name="search")
+
+
 @cli.command("info")
 @click.argument("package")
 @click.option("--detailed", "-d", is_flag=True, help="Show verbose output")
@@ -247,18 +293,23 @@ def info_command(package, detailed) -> None:
         package (str): The package to get information about.
         detailed (bool, optional): Show detailed output. Defaults to False.
     """
+    from mdstream import MarkdownStream
+
+    from pyproject_pip.pypip import get_package_info
+
     try:
         package_info = get_package_info(package, detailed)
-        md = MarkdownStream()
-        md.update(f"# {package_info['name']}")
-        md.update(f"**Version:** {package_info['version']}")
-        md.update(f"**Downloads:** {package_info['downloads']}")
-        md.update(f"**URLs:** {package_info.get('urls', '')}")
-        md.update(f"**Summary:** {package_info['summary']}")
-        md.update("---", final=True)
+        lines = [
+            f"# {package_info['name']}",
+            f"**Version:** {package_info['version']}",
+            f"**Downloads:** {package_info['downloads']}",
+            f"**URLs:** {package_info.get('urls', '')}",
+            f"**Summary:** {package_info['summary']}",
+            "---",
+        ]
         if detailed:
-            md.update(f"**Description:** {package_info['description']}")
-        time.sleep(1)
+            lines.append(f"**Description:** {package_info['description']}")
+        MarkdownStream().update("\n".join(lines), final=True)
     except Exception as e:
         traceback.print_exc()
         sys.exit(1)
@@ -282,6 +333,8 @@ def create_command(project_name, author, description, deps, python_version="3.10
         python_version (str, optional): Python version to use. Defaults to "3.10".
         add_cli (bool, optional): Whether to add a CLI. Defaults to True.
     """
+    from pyproject_pip.create import create_project
+
     try:
         if deps:
             deps = deps.split(",")
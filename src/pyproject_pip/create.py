@@ -1,5 +1,9 @@
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from string import Template
 from typing import Literal
 
 getcwd = Path.cwd
@@ -115,157 +119,61 @@ jobs:
           hatch run pip install '.'
           hatch run test"""
 
+# Encoded once so each scaffold writes the bytes directly.
+WORKFLOW_UBUNTU_BYTES = WORKFLOW_UBUNTU.encode()
+WORKFLOW_MAC_BYTES = WORKFLOW_MAC.encode()
 
-def create_project(
-    project_name,
-    author,
-    description="",
-    deps: list[str] | Literal["local"] | None = None,
-    python_version="3.11",
-    add_cli=True,
-) -> None:
-    # Create project root directory
-    root = Path(getcwd())
-    project_root = root / project_name
-    Path(project_root).mkdir(exist_ok=True)
-    # Create main directories
-    dirs = ["assets", "docs", "examples", "resources", "tests"]
-    for dir in dirs: # noqa
-        Path(root / dir).mkdir(exist_ok=True)
-
-        # Create __about__.py in project directory
-    Path(project_root / "__about__.py").touch(exist_ok=True)
-    # Create __init__.py in project directory
-    if not Path(project_root / "__init__.py").exists() and not Path(project_root / "main.py").exists() and add_cli:
-        Path(project_root / "__init__.py").write_text(
-            "from .main import cli\n\n__all__ = ['cli']",
-        )
-        Path(project_root / "main.py").write_text(
-            "from click import command\n\n@command()\ndef cli() -> None:\n    pass\n\nif __name__ == '__main__':\n    cli()",
-        )
-
-    else:
-        Path(project_root / "__init__.py").touch(exist_ok=True)
-
-    if not Path(project_root / "__about__.py").exists():
-        Path(project_root / "__about__.py").write_text('__version__ = "0.0.1"')
-    elif "__version__" not in Path(project_root / "__about__.py").read_text() and\
-      "y" in input("No __version__ found in __about__.py. Overwrite? (y/n): "):
-        Path(project_root / "__about__.py").write_text("__version__ = '0.0.1'")
-        # Create files in root
-    files = [
-        ("LICENSE", ""),
-        (
-            "README.md",
-            f"# {project_name}\n\n{description}\n\n## Installation\n\n```bash\npip install {project_name}\n```\n",
-        ),
-        (
-            "pyproject.toml",
-            create_pyproject_toml(
-                project_name,
-                author,
-                description,
-                deps,
-                python_version=python_version,
-                add_cli=add_cli,
-            ),
-        ),
-        ("requirements.txt", "click" if add_cli else ""),
-    ]
-    for file, content in files:
-        if Path(root / file).exists() and "y" not in input(
-            f"{file} already exists. Overwrite? (y/n): ",
-        ):
-            print(f"{file} already exists. Skipping...")  # noqa
-            continue
-        Path(root / file).touch(exist_ok=True)
-        Path(root / file).write_text(content)
+_PYTHON_VERSION_RE = re.compile(r">=(\d+)\.(\d+)(?:\.\d+)*$")
 
-    Path("tests").mkdir(exist_ok=True)
-
-    # Create workflows directory
-    workflows = root / ".github/workflows"
-    workflows.mkdir(exist_ok=True, parents=True)
-    if Path(workflows / "macos.yml").exists() or Path(workflows / "ubuntu.yml").exists():
-        should_overwrite = input("Workflows already exist. Overwrite? (y/n): ")
-        if should_overwrite.lower() != "y":
-            return
-    Path(workflows / "macos.yml").touch(exist_ok=True)
-    Path(workflows / "ubuntu.yml").touch(exist_ok=True)
-    Path(workflows / "macos.yml").write_text(WORKFLOW_MAC)
-    Path(workflows / "ubuntu.yml").write_text(WORKFLOW_UBUNTU)
-
-
-def create_pyproject_toml(
-    project_name,
-    author,
-    desc="",
-    deps=None,
-    python_version="3.10",
-    add_cli=True,
-) -> str:
-    """Create a pyproject.toml file for a Hatch project."""
-    authors = ",".join(["{" + f'name="{a}"' + "}" for a in author.split(",")])
-    test_docs = "{tests,docs}"
-    deps = ",\n     ".join([f'"{dep}"' for dep in deps]) if deps else ""
-    python_version = str(python_version)
-    version_str = f"py{python_version.replace('.', '')}"
-    cli_str = f"{project_name} ={project_name}:cli" if add_cli else ""
-
-    python_version_str = ">=" + python_version.lstrip("><=")
-    if len(python_version_str.split(".")) < 2:
-      raise ValueError("Invalid Python version")
-    programming_language = [f"Programming Language :: Python ::3.{str(v)}" for v in range(int(python_version_str.split(".")[1]), 13)]
-    programming_language =  "\n".join(f"\"{programming_language}\"," for programming_language in programming_language)
-
-    return f"""[build-system]
+# Parsed once at import; create_pyproject_toml only fills in the placeholders.
+_PYPROJECT_TEMPLATE = Template("""[build-system]
 requires = ["hatchling"]
 build-backend = "hatchling.build"
 
 [project]
-name = "{project_name}"
+name = "${project_name}"
 dynamic = ["version"]
-description = "{desc}"
+description = "${desc}"
 readme = "README.md"
-requires-python = "{python_version_str}"
+requires-python = "${python_version_str}"
 license = "apache-2.0"
 keywords = []
-authors = [{authors}]
+authors = [${authors}]
 classifiers = [
 "Development Status :: 4 - Beta",
 "Programming Language :: Python",
-{programming_language}
+${programming_language}
 "Programming Language :: Python :: Implementation :: CPython",
 "Programming Language :: Python :: Implementation :: PyPy",
 ]
 
 dependencies = [
-    {deps}
+    ${deps}
 ]
 
 [project.optional-dependencies]
 
 
 [project.urls]
-Documentation = "https://github.com/{author}/{project_name}#readme"
-Issues = "https://github.com/{author}/{project_name}/issues"
-Source = "https://github.com/{author}/{project_name}"
+Documentation = "https://github.com/${author}/${project_name}#readme"
+Issues = "https://github.com/${author}/${project_name}/issues"
+Source = "https://github.com/${author}/${project_name}"
 
 [project.scripts]
-{cli_str}
+${cli_str}
 
 [tool.hatch.version]
-path = "{project_name}/__about__.py"
+path = "${project_name}/__about__.py"
 
 [tool.hatch.metadata]
 allow-direct-references = true
 
 [tool.hatch.build.targets.wheel.force-include]
-"resources" = "{project_name}/resources"
+"resources" = "${project_name}/resources"
 
 [tool.hatch.envs.default]
-python = "{python_version}"
-path = ".{project_name}/envs/{project_name}"
+python = "${python_version}"
+path = ".${project_name}/envs/${project_name}"
 dependencies = [
 "pytest",
 "pytest-mock",
@@ -276,15 +184,15 @@ dependencies = [
 
 [tool.hatch.envs.conda]
 type = "conda"
-python = "{python_version}"
+python = "${python_version}"
 command = "conda"
 conda-forge = false
 environment-file = "environment.yml"
 prefix = ".venv/"
 
 [tool.hatch.envs.default.scripts]
-test = "pytest -vv --ignore third_party {{args:tests}}"
-test-cov = "coverage run -m pytest {{args:tests}}"
+test = "pytest -vv --ignore third_party {args:tests}"
+test-cov = "coverage run -m pytest {args:tests}"
 cov-report = ["- coverage combine", "coverage report"]
 cov = ["test-cov", "cov-report"]
 
@@ -296,16 +204,16 @@ dependencies = [
 "mypy>=1.0.0"
 ]
 [tool.hatch.envs.types.scripts]
-check = "mypy --install-types --non-interactive {{args:{project_name}/ tests}}"
+check = "mypy --install-types --non-interactive {args:${project_name}/ tests}"
 
 [tool.coverage.run]
-source_pkgs = ["{project_name}", "tests"]
+source_pkgs = ["${project_name}", "tests"]
 branch = true
 parallel = true
-omit = ["{project_name}/__about__.py"]
+omit = ["${project_name}/__about__.py"]
 
 [tool.coverage.paths]
-{project_name} = ["{project_name}/"]
+${project_name} = ["${project_name}/"]
 tests = ["tests"]
 
 [tool.coverage.report]
@@ -314,7 +222,7 @@ exclude_lines = ["no cov", "if __name__ == .__main__.:", "if TYPE_CHECKING:"]
 [tool.ruff]
 line-length = 120
 indent-width = 4
-target-version = "{version_str}"
+target-version = "${version_str}"
 
 [tool.ruff.lint]
 extend-unsafe-fixes = ["ALL"]
@@ -341,8 +249,147 @@ line-ending = "auto"
 convention = "google"
 
 [tool.ruff.lint.per-file-ignores]
-"**/{test_docs}/*" = ["ALL"]
+"**/{tests,docs}/*" = ["ALL"]
 "**__init__.py" = ["F401"]
-"""
+""")
+
+
+def create_project(
+    project_name,
+    author,
+    description="",
+    deps: list[str] | Literal["local"] | None = None,
+    python_version="3.11",
+    add_cli=True,
+) -> None:
+    # Create project root directory
+    root = Path(getcwd())
+    project_root = root / project_name
+    project_root.mkdir(exist_ok=True)
+    # Create main directories
+    dirs = ["assets", "docs", "examples", "resources", "tests"]
+    for dir in dirs: # noqa
+        (root / dir).mkdir(exist_ok=True)
+
+    init_py = project_root / "__init__.py"
+    main_py = project_root / "main.py"
+    about_py = project_root / "__about__.py"
+    # List each directory once instead of stat-ing every file before its overwrite prompt.
+    existing_in_project = _existing_names(project_root)
+    existing_in_root = _existing_names(root)
+    # (path, content) pairs, written together once every prompt has been answered
+    writes = []
+    # Create __init__.py in project directory
+    if "__init__.py" not in existing_in_project and "main.py" not in existing_in_project and add_cli:
+        writes.append((init_py, b"from .main import cli\n\n__all__ = ['cli']"))
+        writes.append(
+            (
+                main_py,
+                b"from click import command\n\n@command()\ndef cli() -> None:\n    pass\n\n"
+                b"if __name__ == '__main__':\n    cli()",
+            ),
+        )
+
+    else:
+        init_py.touch(exist_ok=True)
+
+    # Create __about__.py in project directory
+    try:
+        about = about_py.read_text()
+    except FileNotFoundError:
+        writes.append((about_py, b'__version__ = "0.0.1"'))
+    else:
+        if "__version__" not in about and "y" in input("No __version__ found in __about__.py. Overwrite? (y/n): "):
+            writes.append((about_py, b"__version__ = '0.0.1'"))
+    # Create files in root
+    files = [
+        ("LICENSE", ""),
+        (
+            "README.md",
+            f"# {project_name}\n\n{description}\n\n## Installation\n\n```bash\npip install {project_name}\n```\n",
+        ),
+        (
+            "pyproject.toml",
+            create_pyproject_toml(
+                project_name,
+                author,
+                description,
+                deps,
+                python_version=python_version,
+                add_cli=add_cli,
+            ),
+        ),
+        ("requirements.txt", "click" if add_cli else ""),
+    ]
+    for file, content in files:
+        path = root / file
+        if file in existing_in_root and "y" not in input(
+            f"{file} already exists. Overwrite? (y/n): ",
+        ):
+            print(f"{file} already exists. Skipping...")  # noqa
+            continue
+        writes.append((path, content.encode()))
+
+    # Create workflows directory
+    workflows = root / ".github/workflows"
+    existing_workflows = _existing_names(workflows)
+    workflows.mkdir(exist_ok=True, parents=True)
+    macos_yml = workflows / "macos.yml"
+    ubuntu_yml = workflows / "ubuntu.yml"
+    if (
+        not ("macos.yml" in existing_workflows or "ubuntu.yml" in existing_workflows)
+        or input("Workflows already exist. Overwrite? (y/n): ").lower() == "y"
+    ):
+        writes.append((macos_yml, WORKFLOW_MAC_BYTES))
+        writes.append((ubuntu_yml, WORKFLOW_UBUNTU_BYTES))
+
+    # The files are independent, so write them concurrently.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda write: write[0].write_bytes(write[1]), writes))
+
+
+def _existing_names(directory):
+    """Names of the entries in directory, or an empty set if it does not exist yet."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def create_pyproject_toml(
+    project_name,
+    author,
+    desc="",
+    deps=None,
+    python_version="3.10",
+    add_cli=True,
+) -> str:
+    """Create a pyproject.toml file for a Hatch project."""
+    authors = ",".join(["{" + f'name="{a}"' + "}" for a in author.split(",")])
+    deps = ",\n     ".join([f'"{dep}"' for dep in deps]) if deps else ""
+    python_version = str(python_version)
+    version_str = f"py{python_version.replace('.', '')}"
+    cli_str = f"{project_name} ={project_name}:cli" if add_cli else ""
+
+    python_version_str = ">=" + python_version.lstrip("><=")
+    match = _PYTHON_VERSION_RE.match(python_version_str)
+    if match is None:
+        raise ValueError("Invalid Python version")
+    minor = int(match[2])
+    programming_language = "\n".join(f'"Programming Language :: Python :: 3.{v}",' for v in range(minor, 13))
+
+    return _PYPROJECT_TEMPLATE.substitute(
+        project_name=project_name,
+        desc=desc,
+        python_version=python_version,
+        python_version_str=python_version_str,
+        version_str=version_str,
+        authors=authors,
+        author=author,
+        programming_language=programming_language,
+        deps=deps,
+        cli_str=cli_str,
+    )
 
 
@@ -1,61 +1,166 @@
 """Synchronizes requirements and hatch pyproject."""
 
+import atexit
+import importlib
+import importlib.metadata
+import json
 import logging
+import os
 import re
+import shutil
 import subprocess
 import sys
+import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import markdown2
-import requests
-import tomlkit
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
 from rich.logging import RichHandler
 
 from pyproject_pip.create import create_project
 
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+if TYPE_CHECKING:
+    import requests
+    import tomlkit
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib parser
+    orjson = None
+
 logger = logging.getLogger(__name__)
 logger.addHandler(RichHandler())
 
+# requests and tomlkit are imported where they are used, so commands that
+# never reach the network or write pyproject.toml do not pay for them.
+
+
+def _loads_json(content):
+    """Decode a JSON payload, with orjson when it is installed since PyPI responses can be large."""
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+@cache
+def get_session() -> "requests.Session":
+    """Get the requests.Session shared by all PyPI calls.
+
+    Pooled keep-alive connections avoid a new TLS handshake per request, and transient
+    PyPI errors are retried with backoff.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retries))
+    return session
+
+
+_HTML_TAG_RE = re.compile(r"<[^>\n]*>")
+# reST directives (.. image:: URL), roles (:target: URL) and hyperlink targets (.. _name: URL), to end of line.
+_REST_RE = re.compile(r"\.\. .*:: .*|:\w+:.*|\.\. _.*: .*")
+# Markdown syntax that only decorates the text: fences, heading markers, images/links, code spans and emphasis.
+_MD_FENCE_RE = re.compile(r"^[ \t]*(?:```|~~~).*$\n?", re.M)
+_MD_HEADING_RE = re.compile(r"^[ \t]{0,3}#{1,6}[ \t]+", re.M)
+_MD_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_MD_EMPHASIS_RE = re.compile(r"(\*\*|__|\*)(?=\S)(.+?)(?<=\S)\1")
+# Fenced code blocks (body in group 2) and inline code spans (group 3), whose contents are kept verbatim.
+_MD_CODE_RE = re.compile(r"^[ \t]*(```|~~~)[^\n]*\n(.*?)^[ \t]*\1[ \t]*(?:\n|\Z)|`([^`\n]+)`", re.M | re.S)
+_MD_CODE_PLACEHOLDER_RE = re.compile(r"\x00(\d+)\x00")
+
+
 def clean_text(md_text):
     """Convert Markdown to clean plain text."""
-    # Convert Markdown to HTML using markdown2
-    html_description = markdown2.markdown(md_text)
-
-    # Function to remove HTML tags
-    def strip_html_tags(html):
-        clean = re.compile("<.*?>")
-        return re.sub(clean, "", html)
-
-    # Strip HTML tags to get plain text
-    plain_text_description = strip_html_tags(html_description)
-
-    # Function to remove reStructuredText (reST) directives and roles
-    def strip_rst(text):
-        # Remove reST directives and roles
-        text = re.sub(
-            r"\.\. .*:: .*",
-            "",
-            text,
-        )  # remove directives like .. image:: URL
-        text = re.sub(r":\w+:.*", "", text)  # remove roles like :target: URL
-        return re.sub(
-            r"\.\. _.*: .*",
-            "",
-            text,
-        )  # remove hyperlink targets like .. _name: URL
+    # Strip the Markdown syntax directly instead of rendering HTML only to strip it again.
+    # Code is swapped for placeholders first so that the passes below leave `__init__` or `*args` alone.
+    code = []
+
+    def stash_code(match):
+        code.append(match.group(3) if match.group(3) is not None else match.group(2))
+        return f"\x00{len(code) - 1}\x00"
+
+    clean_text = _MD_CODE_RE.sub(stash_code, md_text)
+    clean_text = _MD_FENCE_RE.sub("", clean_text)
+    clean_text = _MD_HEADING_RE.sub("", clean_text)
+    clean_text = _MD_LINK_RE.sub(r"\1", clean_text)
+    clean_text = _MD_EMPHASIS_RE.sub(r"\2", clean_text)
+    clean_text = _HTML_TAG_RE.sub("", clean_text)
+    if code:
+        clean_text = _MD_CODE_PLACEHOLDER_RE.sub(lambda match: code[int(match.group(1))], clean_text)
 
     # Clean the plain text description from reST and other special characters
-    clean_text = strip_rst(plain_text_description)
-    clean_text = re.sub(r"&nbsp;", " ", clean_text)  # Replace HTML entities
-    # clean_text = re.sub(r'\n{2,}', '\n\n', clean_text)  # Replace multiple newlines with a single newline
+    # Every reST pattern needs ".. " or ":", and a substring check is far cheaper than running the regex.
+    if ".. " in clean_text or ":" in clean_text:
+        clean_text = _REST_RE.sub("", clean_text)
+    clean_text = clean_text.replace("&nbsp;", " ")  # Replace HTML entities
     return clean_text.strip()
-    # clean_text = clean_text.replace("\n", " ")
+
+
+# Latest versions fetched from PyPI, persisted between runs as {name: {"version", "etag", "ts"}}.
+_VERSION_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pyproject_pip"
+_VERSION_CACHE_PATH = _VERSION_CACHE_DIR / "versions.json"
+_VERSION_CACHE_TTL = 60 * 60
+_version_cache = None
+# get_latest_version may be called from several threads; only one of them may load the cache.
+_version_cache_lock = threading.Lock()
+
+
+def _load_version_cache():
+    global _version_cache  # noqa: PLW0603
+    with _version_cache_lock:
+        if _version_cache is None:
+            try:
+                loaded = json.loads(_VERSION_CACHE_PATH.read_text())
+            except (OSError, ValueError):
+                loaded = {}
+            # The file may come from an older release or be hand-edited; drop anything not shaped like an entry.
+            _version_cache = (
+                {name: entry for name, entry in loaded.items() if _is_version_cache_entry(entry)}
+                if isinstance(loaded, dict)
+                else {}
+            )
+            atexit.register(_save_version_cache)
+    return _version_cache
+
+
+def _is_version_cache_entry(entry):
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("version"), str)
+        and isinstance(entry.get("ts"), (int, float))
+        and isinstance(entry.get("etag"), (str, type(None)))
+    )
+
+
+def _save_version_cache() -> None:
+    if _version_cache is None:
+        return
+    try:
+        _VERSION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _VERSION_CACHE_PATH.write_text(json.dumps(_version_cache))
+    except OSError:
+        pass
 
 
 def get_latest_version(package_name):
     """Gets the latest version of the specified package from PyPI.
 
+    Results are kept on disk for an hour and revalidated with the stored ETag after that.
+
     Args:
         package_name (str): The name of the package to fetch the latest version for.
 
@@ -63,21 +168,84 @@ def get_latest_version(package_name):
         str or None: The latest version of the package, or None if not found or on error.
     """
     try:
-        response = requests.get(f"https://pypi.org/pypi/{package_name}/json")
-        response.raise_for_status()  # Raises stored HTTPError, if one occurred.
-        data = response.json()
-        releases = data.get("releases", {})
-        if releases:
-            filtered_versions = [version for version in releases if all(part.isdigit() for part in version.split("."))]
-            sorted_versions = sorted(
-                filtered_versions,
-                key=lambda x: tuple(map(int, x.split("."))),
-                reverse=True,
-            )
-            return sorted_versions[0] if sorted_versions else None
+        return _fetch_latest_version(package_name)
     except Exception:
-        pass
-    return None
+        # PyPI could not be reached; a stale entry is still better than no version at all.
+        entry = _load_version_cache().get(package_name)
+        return entry["version"] if entry else None
+
+
+@cache
+def _fetch_latest_version(package_name):
+    """Look up the latest version of a package, raising on error so that only successful lookups are memoized."""
+    cache = _load_version_cache()
+    entry = cache.get(package_name)
+    now = time.time()
+    if entry and now - entry["ts"] < _VERSION_CACHE_TTL:
+        return entry["version"]
+    headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+    response = get_session().get(f"https://pypi.org/pypi/{package_name}/json", headers=headers, timeout=5)
+    if response.status_code == 304:  # noqa: PLR2004
+        entry["ts"] = now
+        return entry["version"]
+    response.raise_for_status()  # Raises stored HTTPError, if one occurred.
+    data = _loads_json(response.content)
+    # PyPI already reports the latest release as info.version; only scan the releases when that is a pre-release.
+    version = (data.get("info") or {}).get("version")
+    if not _is_final_release(version):
+        version = _latest_final_release(data.get("releases", {}))
+    if version is not None:
+        cache[package_name] = {"version": version, "etag": response.headers.get("ETag"), "ts": now}
+    return version
+
+
+def _is_final_release(version):
+    try:
+        return version is not None and not Version(version).is_prerelease
+    except InvalidVersion:
+        return False
+
+
+def _latest_final_release(releases):
+    """Highest final release in a PyPI releases mapping, or None; pre-releases are never picked as "latest"."""
+    version, best_key = None, None
+    for release in releases:
+        try:
+            key = Version(release)
+        except InvalidVersion:
+            continue
+        if not key.is_prerelease and (best_key is None or key > best_key):
+            version, best_key = release, key
+    return version
+
+
+_GITHUB_RE = re.compile(r"github\.com", re.I)
+_REPOSITORY_URL_KEYS = ("Source", "Repository", "Homepage", "Code")
+
+
+def _github_url(project_urls):
+    """First GitHub URL in a PyPI project_urls mapping, which PyPI may send as null."""
+    if not project_urls:
+        return None
+    # Most projects list their repository under one of these keys, so try them before scanning every URL.
+    for key in _REPOSITORY_URL_KEYS:
+        url = project_urls.get(key)
+        if url and _GITHUB_RE.search(url):
+            return url
+    return next((url for url in project_urls.values() if url and _GITHUB_RE.search(url)), None)
+
+
+@lru_cache(maxsize=512)
+def _project_info(package_name):
+    """Fetch the "info" and "downloads" tables of a package's PyPI JSON.
+
+    Errors propagate, so lru_cache only keeps successful lookups and a transient failure is retried.
+    The tables are shared between callers and must not be mutated.
+    """
+    response = get_session().get(f"https://pypi.org/pypi/{package_name}/json", timeout=5)
+    response.raise_for_status()  # Raises stored HTTPError, if one occurred.
+    data = _loads_json(response.content)
+    return data.get("info") or {}, data.get("downloads") or {}
 
 
 def search_package(package_name):
@@ -89,22 +257,17 @@ def search_package(package_name):
     Returns:
         dict: The package information.
     """
+    import requests
+
     package_info = {}
     try:
-        response = requests.get(f"https://pypi.org/pypi/{package_name}/json", timeout=5)
-        response.raise_for_status()  # Raises stored HTTPError, if one occurred.
-        data = response.json()
-        info = data.get("info", {})
+        info, _ = _project_info(package_name)
 
         package_info["description"] = info.get("summary", "")
         package_info["details"] = info.get("description", "")
         logging.debug("Package : %s", package_info)
         # Get GitHub URL if available
-        project_urls = info.get("project_urls", {})
-        package_info["github_url"] = next(
-            (url for _, url in project_urls.items() if "github.com" in url.lower()),
-            None,
-        )
+        package_info["github_url"] = _github_url(info.get("project_urls"))
     except requests.RequestException:
         pass
     except Exception:
@@ -113,65 +276,38 @@ def search_package(package_name):
     return package_info
 
 
+# Name span inside each search result snippet, without running past the snippet's closing </a>.
+_SNIPPET_NAME_RE = re.compile(
+    r'<a class="package-snippet"(?:(?!</a>).)*?<span class="package-snippet__name">([^<]*)</span>',
+    re.S,
+)
+
+
 def get_package_names(query_key):
     """Fetch package names from PyPI search results."""
     search_url = f"https://pypi.org/search/?q={query_key}"
-    response = requests.get(search_url, timeout=5)
+    response = get_session().get(search_url, timeout=5)
     response.raise_for_status()
-    page_content = response.text
 
     # Extract package names from search results
-    start_token = '<a class="package-snippet"'
-    end_token = "</a>"
-    name_token = '<span class="package-snippet__name">'
-
-    package_names = []
-    start = 0
-    while True:
-        start = page_content.find(start_token, start)
-        if start == -1:
-            break
-        end = page_content.find(end_token, start)
-        snippet = page_content[start:end]
-        name_start = snippet.find(name_token)
-        if name_start != -1:
-            name_start += len(name_token)
-            name_end = snippet.find("</span>", name_start)
-            package_name = snippet[name_start:name_end]
-            package_names.append(package_name)
-        start = end
-
-    return package_names
+    return _SNIPPET_NAME_RE.findall(response.text)
 
 
 def get_package_info(package_name, verbose=False):
     """Retrieve detailed package information from PyPI JSON API."""
-    package_url = f"https://pypi.org/pypi/{package_name}/json"
-    response = requests.get(package_url, timeout=5)
-    response.raise_for_status()
-    package_data = response.json()
-
-    info = package_data.get("info", {})
-
-    downloads = package_data.get("downloads", {}).get("last_month", 0)
+    info, downloads = _project_info(package_name)
+    downloads = downloads.get("last_month", 0)
 
     package_info = {
         "name": info.get("name", ""),
         "version": info.get("version", ""),
         "summary": info.get("summary", ""),
         "downloads": downloads,
-        "urls": info.get("project_urls", {}),
+        "urls": dict(info.get("project_urls") or {}),
     }
     if verbose:
         package_info["description"] = clean_text(info.get("description", ""))
-    project_urls = info.get("project_urls", {})
-    try:
-        package_info["github_url"] = next(
-            (url for _, url in project_urls.items() if "github.com" in url.lower()),
-            None,
-        )
-    except (StopIteration, TypeError, AttributeError):
-        package_info["github_url"] = None
+    package_info["github_url"] = _github_url(info.get("project_urls"))
 
     return package_info
 
@@ -188,10 +324,11 @@ def find_and_sort(query_key, limit=5, sort_key="downloads") -> list:
     """
     try:
         package_names = get_package_names(query_key)
-        packages = []
-        for package_name in package_names:
-            package_info = get_package_info(package_name)
-            packages.append(package_info)
+        if not package_names:
+            return []
+        # The lookups are independent, so fetch them concurrently over the shared session.
+        with ThreadPoolExecutor(max_workers=min(16, len(package_names))) as executor:
+            packages = list(executor.map(get_package_info, package_names))
         # Sort the packages by the specified key
         sorted_packages = sorted(
             packages,
@@ -200,12 +337,38 @@ def find_and_sort(query_key, limit=5, sort_key="downloads") -> list:
         )
         return sorted_packages[:limit]
 
-    except requests.RequestException:
-        return []
     except Exception:
         return []
 
 
+def clear_caches() -> None:
+    """Forget every memoized PyPI response, so a long-running process sees fresh data."""
+    _fetch_latest_version.cache_clear()
+    _project_info.cache_clear()
+
+
+def _parse_requirements(lines):
+    """Map each requirement's base package name to its full line, skipping blanks and comments."""
+    requirements = {}
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            requirements[_requirement_key(line)] = line
+    return requirements
+
+
+def _requirement_key(line):
+    """Key a requirement line by its package name, unless it carries a marker or direct reference.
+
+    Those lines are kept verbatim under their own key, so variants of one package for different
+    environments never overwrite each other and installing the package never replaces them.
+    Option lines such as "-e ./path" or "-r other.txt" have no name and key by the whole line as well.
+    """
+    if ";" in line or "@" in line:
+        return line
+    return base_name(line)
+
+
 def modify_requirements(package_name, package_version=None, action="install") -> None:
     """Modify the requirements.txt file to install or uninstall a package.
 
@@ -217,135 +380,161 @@ def modify_requirements(package_name, package_version=None, action="install") ->
     Raises:
         FileNotFoundError: If the requirements.txt file does not exist when attempting to read.
     """
-    lines = get_requirements_packages(as_set=False)
-
-    # Extract the base package name and optional extras
-    base_package_name, *extras = package_name.split("[")
-    extras_str = "[" + ",".join(extras) if extras else ""
-    package_line = next(
-        (line for line in lines if base_package_name == line.split("[")[0].split("==")[0]),
-        None,
-    )
+    modify_requirements_bulk([(package_name, package_version)], action=action)
 
-    if action == "install":
-        if package_version is not None:
-            new_line = f"{base_package_name}{extras_str}=={package_version}"
-        else:
-            new_line = f"{base_package_name}{extras_str}"
 
-        if package_line:
-            # Replace the line with the same base package name
-            lines = [line if base_package_name != line.split("[")[0].split("==")[0] else new_line for line in lines]
-        else:
-            lines.append(new_line)
+def modify_requirements_bulk(packages, action="install") -> None:
+    """Modify the requirements.txt file for several packages with a single read and write.
 
-    elif action == "uninstall":
-        # Remove lines with the same base package name
-        lines = [line for line in lines if base_package_name != line.split("[")[0].split("==")[0]]
+    Args:
+        packages (list[tuple[str, str | None]]): (package_name, package_version) pairs to install or uninstall.
+        action (str): The action to perform, either 'install' or 'uninstall'.
 
+    Raises:
+        FileNotFoundError: If the requirements.txt file does not exist when attempting to read.
+    """
+    # Keyed by base name so each lookup, replacement and removal is O(1); dicts keep the file's order.
+    with Path("requirements.txt").open() as f:
+        requirements = _parse_requirements(f)
+
+    for package_name, package_version in packages:
+        # Extract the base package name and optional extras
+        base_package_name, bracket, extras = package_name.partition("[")
+        extras_str = bracket + extras
+        key = _requirement_key(package_name)
+
+        if action == "install":
+            if package_version is not None:
+                requirements[key] = f"{base_package_name}{extras_str}=={package_version}"
+            else:
+                requirements[key] = f"{base_package_name}{extras_str}"
+
+        elif action == "uninstall":
+            requirements.pop(key, None)
+
+    _requirements_lines.cache_clear()
+    _requirements_base_names.cache_clear()
     # Ensure each line ends with a newline character
-    lines = [line + "\n" for line in lines]
-    with open("requirements.txt", "w") as f:
-        f.writelines(lines)
-
-
-def is_group(line):
-    return "[" in line and "]" in line and '"' not in line[line.index("[") : line.index("]")]
-
-
-def process_dependencies(line, output_lines) -> None:
-    lines = []
-    if "[" in line and ("]" not in line or "," not in line):
-        start = line.index("[")
-        lines.append(line[: start + 1])
-        line = line[start + 1 :]
-
-    deps = line.split(",")
-    i = 0
-    while i < len(deps):
-        dep = deps[i]
-        if "[" in dep and "]" not in dep:
-            while "]" not in dep:
-                dep += "," + deps[i + 1]
-                i += 1
-            lines.append(dep + ",")
-            i += 1
-            continue
-        if dep.endswith("]"):
-            dep = dep.replace("]", "")
-            lines.append(dep)
-            lines.append("]")
-            i += 1
-            continue
-        new_dep = dep + "," if dep != deps[-1] else dep
-        if new_dep.strip():
-            lines.append(new_dep)
-        i += 1
+    with Path("requirements.txt").open("w") as f:
+        f.write("\n".join(requirements.values()) + ("\n" if requirements else ""))
 
-    for line in lines:
-        output_lines.append(
-            "  " + line.strip() if not line.strip().startswith("[") else line.strip(),
-        )
+
+def _file_key(path):
+    """Cache key for a file's current contents: its resolved path plus mtime and size.
+
+    Functions memoized on this key re-read the file as soon as it changes. Raises FileNotFoundError if it is missing.
+    """
+    path = Path(path)
+    stat = path.stat()
+    return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=8)
+def _parse_pyproject(file_key):
+    import tomlkit
+
+    # TOML is always UTF-8; parsing the raw bytes skips the locale-dependent text decode.
+    return tomlkit.parse(Path(file_key[0]).read_bytes())
+
+
+def load_pyproject(pyproject_path="pyproject.toml") -> "tomlkit.TOMLDocument":
+    """Parse pyproject.toml with tomlkit, reusing the previous parse while the file is unchanged.
+
+    Args:
+        pyproject_path (str, optional): Path to the pyproject.toml file. Defaults to "pyproject.toml".
+
+    Returns:
+        tomlkit.TOMLDocument: The parsed document.
+    """
+    return _parse_pyproject(_file_key(pyproject_path))
+
+
+_PROJECT_HEADER_RE = re.compile(rb"^\[project\][ \t]*(?:#.*)?$", re.M)
+_TABLE_HEADER_RE = re.compile(rb"^[ \t]*\[", re.M)
+# Only a flat array of plain double-quoted strings matches; comments, escapes or other quoting fall back to tomllib.
+_DEPENDENCIES_RE = re.compile(rb'^dependencies[ \t]*=[ \t]*\[((?:\s*"[^"\\\n]*"\s*,?)*\s*)\]', re.M)
+_QUOTED_RE = re.compile(rb'"([^"\\\n]*)"')
+
+
+def read_project_dependencies(pyproject_path="pyproject.toml") -> list | None:
+    """Extract [project] dependencies from pyproject.toml without parsing the whole file.
+
+    Args:
+        pyproject_path (str, optional): Path to the pyproject.toml file. Defaults to "pyproject.toml".
+
+    Returns:
+        list[str] | None: The dependencies, or None if the file is not simple enough to read this way.
+    """
+    content = Path(pyproject_path).read_bytes()
+    header = _PROJECT_HEADER_RE.search(content)
+    if header is None:
+        return None
+    next_header = _TABLE_HEADER_RE.search(content, header.end())
+    section = content[header.end() : next_header.start() if next_header else len(content)]
+    match = _DEPENDENCIES_RE.search(section)
+    if match is None:
+        return None
+    try:
+        return [dep.decode() for dep in _QUOTED_RE.findall(match.group(1))]
+    except UnicodeDecodeError:
+        return None
+
+
+def read_pyproject(pyproject_path="pyproject.toml") -> dict:
+    """Parse pyproject.toml for reading only.
+
+    The stdlib parser is much faster than tomlkit; use load_pyproject when the document will be written back.
+
+    Args:
+        pyproject_path (str, optional): Path to the pyproject.toml file. Defaults to "pyproject.toml".
+
+    Returns:
+        dict: The parsed document.
+    """
+    # One read of the whole file, without a buffered reader in between.
+    return tomllib.loads(Path(pyproject_path).read_bytes().decode())
 
 
 def write_pyproject(data, filename="pyproject.toml") -> None:
     """Write the modified pyproject.toml data back to the file."""
-    original_data = Path(filename).read_text()
+    import tomlkit
+
+    toml_str = tomlkit.dumps(data)
+    # tomlkit keeps the file's CRLF endings but emits rebuilt arrays with bare "\n"; use the file's style throughout.
+    if "\r\n" in toml_str:
+        toml_str = toml_str.replace("\r\n", "\n").replace("\n", "\r\n")
+    _parse_pyproject.cache_clear()
+    _pyproject_base_names.cache_clear()
+    # Write next to the file and swap it in, so a failed write cannot leave it truncated.
+    # Resolve symlinks first so the link target is updated rather than replaced by a regular file.
+    path = Path(filename).resolve()
+    tmp_path = path.with_name(path.name + ".tmp")
     try:
-        with Path(filename).open("w") as f:
-            toml_str = tomlkit.dumps(data)
-            inside_dependencies = False
-            inside_optional_dependencies = False
-
-            input_lines = toml_str.splitlines()
-            output_lines = []
-            for input_line in input_lines:
-                line = input_line.rstrip()
-                if is_group(line):
-                    inside_dependencies = False
-                    inside_optional_dependencies = "optional-dependencies" in line
-                    output_lines.append(line)
-                    continue
-
-                if "]" in line and inside_dependencies and "[" not in line:
-                    inside_dependencies = False
-
-                if inside_optional_dependencies:
-                    process_dependencies(line, output_lines)
-
-                if (
-                    "dependencies" in line
-                    and "optional-dependencies" not in line
-                    and "extra-dependencies" not in line
-                    and not inside_optional_dependencies
-                ):
-                    inside_dependencies = True
-                    inside_optional_dependencies = False
-                    output_lines.append(line[: line.index("[") + 1])
-                    line = line[line.index("[") + 1 :]
-
-                if inside_dependencies and not inside_optional_dependencies:
-                    inside_optional_dependencies = False
-                    process_dependencies(line, output_lines)
-
-                elif not inside_dependencies and not inside_optional_dependencies:
-                    output_lines.append(line)
-
-            for line in output_lines:
-                line: str = line.strip()
-                line = line.removesuffix(",") if line.endswith("],") else line
-                chunks = line.split("==")
-                if len(chunks) > 2:
-                    line = "==".join(chunks[:2])
-                    if not line.endswith('",'):
-                        line += '",'
-
-                f.write(line + "\n")
-    except Exception:
-        with Path(filename).open("w") as f:
-            f.write(original_data)
+        # Bytes out, so the newline translation of text mode cannot change the line endings again.
+        tmp_path.write_bytes(toml_str.encode())
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
+def _dependency_array(dependencies):
+    """Wrap a dependency list in a tomlkit array that serializes one entry per line."""
+    import tomlkit
+
+    array = tomlkit.array()
+    array.extend(dependencies)
+    return array.multiline(True)
+
+
+# A distribution name, only when followed by extras, a version specifier, an environment marker,
+# a direct reference or the end, so "git+https://..." and "src/pkg" are not cut down to "git" and "src".
+_REQUIREMENT_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*(?=\s*(?:[\[=<>!~;@]|$))")
+
+
+@lru_cache(maxsize=4096)
 def base_name(package_name):
     """Extract the base package name from a package name with optional extras.
 
@@ -353,20 +542,119 @@ def base_name(package_name):
         package_name (str): The package name with optional extras.
 
     Returns:
-        str: The base package name without extras.
+        str: The base package name without extras, or package_name unchanged if it does not start with one.
     """
-    return package_name.split("[")[0].split("==")[0]
+    match = _REQUIREMENT_NAME_RE.match(package_name)
+    return match.group() if match else package_name
+
+
+def is_bare_requirement(package_name) -> bool:
+    """Check whether package_name is only a package name with optional extras, so a version can be pinned onto it.
+
+    Args:
+        package_name (str): The requirement spec.
+
+    Returns:
+        bool: False if it has its own specifier, marker or direct reference, or is not a name at all.
+    """
+    package_name = package_name.strip()
+    name = base_name(package_name)
+    if name == package_name:
+        return _REQUIREMENT_NAME_RE.match(package_name) is not None
+    rest = package_name[len(name) :].strip()
+    return rest[0] == "[" and rest.find("]") == len(rest) - 1
 
 
 def name_and_version(package_name, upgrade=False):
     if upgrade:
-        version = get_latest_version(base_name(package_name))
-        return base_name(package_name), version
+        package_name = package_name.partition("==")[0]
+        if not is_bare_requirement(package_name):
+            return package_name, None
+        return package_name, get_latest_version(base_name(package_name))
     if "==" in package_name:
         return package_name.split("==")
     return package_name, None
 
 
+def _pip_main():
+    try:
+        from pip import __version__ as pip_version
+        from pip._internal.cli.main import main
+    except ImportError:
+        return None
+    # pip._internal is not a public API, so only use it where this entry point is known to exist.
+    if Version(pip_version) < Version("21.0"):
+        return None
+    return main
+
+
+def run_pip(args) -> None:
+    """Run pip with the given arguments, in-process when possible to skip interpreter startup.
+
+    Falls back to `python -m pip` in a subprocess when pip's internal entry point is unavailable.
+
+    Args:
+        args (list[str]): Arguments to pass to pip, e.g. ["install", "requests"].
+
+    Raises:
+        subprocess.CalledProcessError: If pip exits with a non-zero status.
+    """
+    pip_main = _pip_main()
+    if pip_main is None:
+        subprocess.run([sys.executable, "-m", "pip", *args], check=True)
+        return
+    returncode = pip_main(list(args))
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, ["pip", *args])
+
+
+@lru_cache(maxsize=1)
+def pip_supports_report() -> bool:
+    """Check whether the installed pip has `pip install --report`, which was added in pip 22.2.
+
+    Returns:
+        bool: True if --report can be passed to pip install.
+    """
+    try:
+        return Version(importlib.metadata.version("pip")) >= Version("22.2")
+    except (importlib.metadata.PackageNotFoundError, InvalidVersion):
+        return False
+
+
+def installed_version(package_name) -> str | None:
+    """Get the installed version of a package from its metadata.
+
+    Args:
+        package_name (str): The name of the package.
+
+    Returns:
+        str or None: The installed version, or None if the package is not installed.
+    """
+    try:
+        return importlib.metadata.version(package_name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def read_pip_report(report_path) -> dict:
+    """Read the versions pip installed from a `pip install --report` file.
+
+    Args:
+        report_path (str): Path to the JSON report written by pip.
+
+    Returns:
+        dict: Installed versions keyed by canonicalized package name.
+    """
+    try:
+        with Path(report_path).open() as f:
+            report = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {
+        canonicalize_name(item["metadata"]["name"]): item["metadata"]["version"] for item in report.get("install", [])
+    }
+
+
 def modify_dependencies(dependencies, package_version_str, action):
     """Modify the dependencies list for installing or uninstalling a package.
 
@@ -378,10 +666,17 @@ def modify_dependencies(dependencies, package_version_str, action):
     Returns:
         list: Modified list of dependencies.
     """
-    dependencies = [dep.strip() for dep in dependencies if base_name(dep) != base_name(package_version_str)]
+    return _modify_dependencies_bulk(dependencies, [package_version_str], action)
+
+
+def _modify_dependencies_bulk(dependencies, package_version_strs, action):
+    """modify_dependencies for several packages at once: one filter pass and one sort."""
+    # Keyed like requirement lines so a later entry for the same package wins, as with sequential calls.
+    targets = {_requirement_key(package): package.strip() for package in package_version_strs}
+    dependencies = [dep.strip() for dep in dependencies if _requirement_key(dep) not in targets]
     if action == "install":
-        dependencies.append(package_version_str.strip())
-    dependencies.sort(key=lambda x: x.lower())  # Sort dependencies alphabetically
+        dependencies.extend(targets.values())
+    dependencies.sort(key=str.lower)  # Sort dependencies alphabetically
     return dependencies
 
 
@@ -402,18 +697,43 @@ def modify_pyproject_toml(
         hatch_env (str, optional): The Hatch environment to use. Defaults to "default".
         dependency_group (str, optional): The group of dependencies to modify. Defaults to "dependencies".
     """
+    modify_pyproject_toml_bulk(
+        [(package_name, package_version)],
+        action=action,
+        hatch_env=hatch_env,
+        dependency_group=dependency_group,
+        pyproject_path=pyproject_path,
+    )
+
+
+def modify_pyproject_toml_bulk(
+    packages,
+    action="install",
+    hatch_env=None,
+    dependency_group="dependencies",
+    pyproject_path="pyproject.toml",
+) -> None:
+    """Modify the pyproject.toml file for several packages with a single parse and write.
+
+    Args:
+        packages (list[tuple[str, str | None]]): (package_name, package_version) pairs to install or uninstall.
+        action (str): The action to perform, either 'install' or 'uninstall'.
+        hatch_env (str, optional): The Hatch environment to use. Defaults to "default".
+        dependency_group (str, optional): The group of dependencies to modify. Defaults to "dependencies".
+        pyproject_path (str, optional): Path to the pyproject.toml file. Defaults to "pyproject.toml".
+    """
     pyproject_path = Path(pyproject_path)
     if not pyproject_path.exists():
-        action = input(
+        answer = input(
             "pyproject.toml not found. Do you want to create it? (y/n): ",
         ).lower()
-        if "y" in action.lower():
+        if "y" in answer:
             create_project(
                 input("Enter project name: "),
                 input("Enter author name: "),
                 input("Enter project description: "),
             )
-        elif "n" in action.lower() and "y" in input("Check parent dirs? (y/n): ").lower():
+        elif "n" in answer and "y" in input("Check parent dirs? (y/n): ").lower():
             for _ in range(3):
                 if pyproject_path.exists():
                     break
@@ -422,9 +742,7 @@ def modify_pyproject_toml(
             if not pyproject_path.exists():
                 sys.exit(1)
 
-    with open(pyproject_path) as f:
-        content = f.read()
-        pyproject = tomlkit.parse(content)
+    pyproject = load_pyproject(pyproject_path)
 
     is_optional = dependency_group != "dependencies"
     is_hatch_env = hatch_env and "tool" in pyproject and "hatch" in pyproject["tool"]
@@ -433,40 +751,39 @@ def modify_pyproject_toml(
             "Hatch environment specified but hatch tool not found in pyproject.toml.",
         )
 
-    # Prepare the package string with version if provided
-    package_version_str = f"{package_name}{('==' + package_version) if package_version else ''}"
     base_project = (
         pyproject.get("tool", {}).get("hatch", {}).get("envs", {}).get(hatch_env, {})
         if is_hatch_env
         else pyproject.get("project", {})
     )
-    optional_base = pyproject.get("project").get("optional-dependencies", {})
-
+    optional_base = pyproject.get("project").get("optional-dependencies", {}) if is_optional else None
+
+    # Prepare the package strings with versions if provided
+    package_version_strs = [
+        f"{package_name}{('==' + package_version) if package_version else ''}"
+        for package_name, package_version in packages
+    ]
+    # Each group is filtered and sorted once for the whole batch rather than once per package.
     if is_optional:
         dependencies = optional_base.get(dependency_group, [])
-        optional_base[dependency_group] = modify_dependencies(
-            dependencies,
-            package_version_str,
-            action,
-        )
-
-        all_group = optional_base.get("all", [])
-        optional_base["all"] = modify_dependencies(
-            all_group,
-            package_version_str,
-            action,
+        optional_base[dependency_group] = _dependency_array(
+            _modify_dependencies_bulk(dependencies, package_version_strs, action),
         )
-        pyproject["project"]["optional-dependencies"] = optional_base
+        if dependency_group != "all":
+            all_group = optional_base.get("all", [])
+            optional_base["all"] = _dependency_array(_modify_dependencies_bulk(all_group, package_version_strs, action))
     else:
         dependencies = base_project.get("dependencies", [])
-        base_project["dependencies"] = modify_dependencies(
-            dependencies,
-            package_version_str,
-            action,
+        base_project["dependencies"] = _dependency_array(
+            _modify_dependencies_bulk(dependencies, package_version_strs, action),
         )
+    # Tables already in the document were edited in place; reassigning them would rebuild the subtree.
+    if is_optional and "optional-dependencies" not in pyproject["project"]:
+        pyproject["project"]["optional-dependencies"] = optional_base
     if is_hatch_env:
-        pyproject["tool"]["hatch"]["envs"][hatch_env] = base_project
-    else:
+        if hatch_env not in pyproject["tool"]["hatch"]["envs"]:
+            pyproject["tool"]["hatch"]["envs"][hatch_env] = base_project
+    elif "project" not in pyproject:
         pyproject["project"] = base_project
 
     write_pyproject(pyproject, pyproject_path)
@@ -476,14 +793,15 @@ def get_pip_freeze():
     """Get the list of installed packages as a set.
 
     Returns:
-        set: Set of installed packages with their versions.
+        frozenset: Set of installed packages with their versions.
     """
-    result = subprocess.run(
-        [sys.executable, "-m", "pip", "freeze", "--local"],
-        stdout=subprocess.PIPE,
-        check=False,
+    # Read the installed metadata in-process instead of spawning `pip freeze`.
+    importlib.invalidate_caches()
+    return frozenset(
+        f"{dist.metadata['Name']}=={dist.version}"
+        for dist in importlib.metadata.distributions()
+        if dist.metadata["Name"]
     )
-    return set(result.stdout.decode().splitlines())
 
 
 def is_package_in_requirements(
@@ -496,23 +814,34 @@ def is_package_in_requirements(
         package_name (str): The name of the package.
 
     Returns:
-        bool: True if the package is listed in requirements.txt, False otherwise.
+        bool: True if the package is listed in requirements.txt, False otherwise or if the file does not exist.
     """
-    if not Path(requirements_path).exists():
-        raise FileNotFoundError("requirements.txt file not found.")
-    with Path(requirements_path).open() as f:
-        return any(base_name(package_name) == base_name(line) for line in f)
+    try:
+        file_key = _file_key(requirements_path)
+    except FileNotFoundError:
+        return False
+    return base_name(package_name) in _requirements_base_names(file_key)
+
+
+@lru_cache(maxsize=8)
+def _requirements_base_names(file_key):
+    return frozenset(base_name(line) for line in _requirements_lines(file_key))
 
 
 def get_requirements_packages(requirements="requirements.txt", as_set=True):
     """Get the list of packages from the requirements.txt file.
 
     Returns:
-        set: Set of packages listed in the requirements.txt file.
+        frozenset: Set of packages listed in the requirements.txt file, or a list in file order if as_set is False.
     """
-    with Path(requirements).open() as f:
-        lines = [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
-    return set(lines) if as_set else lines
+    lines = _requirements_lines(_file_key(requirements))
+    return frozenset(lines) if as_set else list(lines)
+
+
+@lru_cache(maxsize=4)
+def _requirements_lines(file_key):
+    with Path(file_key[0]).open() as f:
+        return tuple(line for line in map(str.strip, f) if line and not line.startswith("#"))
 
 
 def is_package_in_pyproject(
@@ -529,11 +858,17 @@ def is_package_in_pyproject(
     Returns:
         bool: True if the package is listed in pyproject.toml, False otherwise.
     """
-    if not Path(pyproject_path).exists():
-        raise FileNotFoundError("pyproject.toml file not found.")
-    with Path(pyproject_path).open() as f:
-        content = f.read()
-        pyproject = tomlkit.parse(content)
+    try:
+        file_key = _file_key(pyproject_path)
+    except FileNotFoundError:
+        raise FileNotFoundError("pyproject.toml file not found.") from None
+    # Exact base-name match, so "requests" does not match "requests-toolbelt".
+    return base_name(package_name) in _pyproject_base_names(file_key, hatch_env)
+
+
+@lru_cache(maxsize=8)
+def _pyproject_base_names(file_key, hatch_env):
+    pyproject = read_pyproject(file_key[0])
     is_hatch_env = hatch_env and "tool" in pyproject and "hatch" in pyproject["tool"]
     if hatch_env and not is_hatch_env:
         raise ValueError(
@@ -542,5 +877,5 @@ def is_package_in_pyproject(
     if is_hatch_env:
         dependencies = pyproject["tool"]["hatch"]["envs"][hatch_env]["dependencies"]
     else:
-        dependencies = pyproject.get("dependencies", [])
-    return any(package_name in dep for dep in dependencies)
+        dependencies = pyproject.get("project", {}).get("dependencies", [])
+    return frozenset(base_name(dep) for dep in dependencies)
@@ -0,0 +1,76 @@
+import importlib.metadata
+import json
+
+from click.testing import CliRunner
+from pyproject_pip import pypip
+from pyproject_pip.cli import cli
+
+
+def fake_pip(installed):
+    def run_pip(args):
+        run_pip.calls.append(args)
+        if "--report" not in args:
+            return
+        report_path = args[args.index("--report") + 1]
+        with open(report_path, "w") as f:
+            json.dump({"install": [{"metadata": {"name": n, "version": v}} for n, v in installed.items()]}, f)
+
+    run_pip.calls = []
+    return run_pip
+
+
+def test_install_upgrade_keeps_own_specifier(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "demo"\ndependencies = []\n')
+    (tmp_path / "requirements.txt").write_text("")
+    monkeypatch.setattr(pypip, "run_pip", fake_pip({"requests": "2.31.0", "click": "8.1.7"}))
+
+    result = CliRunner().invoke(cli, ["install", "-U", "requests>=2.0", "click"])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "requirements.txt").read_text() == "requests>=2.0\nclick==8.1.7\n"
+    assert pypip.read_pyproject(tmp_path / "pyproject.toml")["project"]["dependencies"] == [
+        "click==8.1.7",
+        "requests>=2.0",
+    ]
+
+
+def test_install_upgrade_without_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "demo"\ndependencies = []\n')
+    (tmp_path / "requirements.txt").write_text("")
+    run_pip = fake_pip({})
+    monkeypatch.setattr(pypip, "run_pip", run_pip)
+    monkeypatch.setattr(pypip, "pip_supports_report", lambda: False)
+
+    result = CliRunner().invoke(cli, ["install", "-U", "click"])
+    assert result.exit_code == 0, result.output
+    assert run_pip.calls == [["install", "-U", "click"]]
+    # Not in a report, so the installed version is recorded instead of PyPI's latest.
+    assert (tmp_path / "requirements.txt").read_text() == f"click=={importlib.metadata.version('click')}\n"
+
+
+def test_install_without_upgrade_skips_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "demo"\ndependencies = []\n')
+    (tmp_path / "requirements.txt").write_text("")
+    run_pip = fake_pip({})
+    monkeypatch.setattr(pypip, "run_pip", run_pip)
+
+    result = CliRunner().invoke(cli, ["install", "click"])
+    assert result.exit_code == 0, result.output
+    assert run_pip.calls == [["install", "click"]]
+    assert (tmp_path / "requirements.txt").read_text() == "click\n"
+
+
+def test_uninstall_passes_non_name_specs_through(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "demo"\ndependencies = ["requests"]\n')
+    (tmp_path / "requirements.txt").write_text("requests\n")
+    run_pip = fake_pip({})
+    monkeypatch.setattr(pypip, "run_pip", run_pip)
+
+    result = CliRunner().invoke(cli, ["uninstall", "requests[socks]>=2", "git+https://github.com/a/b.git"])
+    assert result.exit_code == 0, result.output
+    assert run_pip.calls == [["uninstall", "-y", "requests", "git+https://github.com/a/b.git"]]
+    assert "Successfully uninstalled git\n" not in result.output
+    assert (tmp_path / "requirements.txt").read_text() == ""
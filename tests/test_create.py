@@ -1,12 +1,18 @@
 import pytest
-from unittest.mock import patch, call
-from pyproject_pip.create import create_project
+from pathlib import Path
+from unittest.mock import DEFAULT, call, patch
+from pyproject_pip.create import WORKFLOW_MAC_BYTES, WORKFLOW_UBUNTU_BYTES, create_project, create_pyproject_toml
+
+
+def patch_path():
+    """Patch every Path method create_project touches in one go; yields a dict of the mocks."""
+    return patch.multiple(Path, mkdir=DEFAULT, write_text=DEFAULT, write_bytes=DEFAULT, touch=DEFAULT)
 
 
 @pytest.fixture
-def mock_cwd(tmp_path):
-    with patch("pyproject_pip.create.getcwd", return_value=str(tmp_path)):
-        yield tmp_path
+def mock_cwd(tmp_path, monkeypatch):
+    monkeypatch.setattr("pyproject_pip.create.getcwd", lambda: str(tmp_path))
+    return tmp_path
 
 
 def test_create_project(mock_cwd):
@@ -16,48 +22,50 @@ def test_create_project(mock_cwd):
     deps = ["pytest", "numpy"]
 
     with (
-        patch("pyproject_pip.create.Path.mkdir") as mock_mkdir,
-        patch("pyproject_pip.create.Path.write_text") as mock_write_text,
-        patch("pyproject_pip.create.Path.touch") as mock_touch,
+        patch_path() as mocks,
         patch(
             "pyproject_pip.create.create_pyproject_toml",
             return_value="mock_pyproject_content",
         ) as mock_create_pyproject,
     ):
+        mock_mkdir, mock_write_text, mock_write_bytes, mock_touch = (
+            mocks["mkdir"],
+            mocks["write_text"],
+            mocks["write_bytes"],
+            mocks["touch"],
+        )
         create_project(project_name, author, description, deps)
 
         # Check if directories were created
-        assert mock_mkdir.call_count == 8  # 5 dirs + 1 for tests
-        mock_mkdir.assert_has_calls([call(exist_ok=True) for _ in range(7)], any_order=True)
+        assert mock_mkdir.call_count == 7  # project root + 5 dirs + workflows
+        mock_mkdir.assert_has_calls([call(exist_ok=True) for _ in range(6)], any_order=True)
 
         # Check if files were created with correct content
-        assert mock_write_text.call_count == 9  # LICENSE, README.md, pyproject.toml, __about__.py
-        mock_write_text.assert_has_calls(
+        assert mock_write_bytes.call_count == 9  # __init__.py, main.py, __about__.py, 4 root files, 2 workflows
+        mock_write_bytes.assert_has_calls(
             [
-                call(""),  # LICENSE
+                call(b""),  # LICENSE
                 call(
-                    f"# {project_name}\n\n{description}\n\n## Installation\n\n```bash\npip install {project_name}\n```\n"
+                    f"# {project_name}\n\n{description}\n\n## Installation\n\n```bash\npip install {project_name}\n```\n".encode()
                 ),  # README.md
-                call("mock_pyproject_content"),  # pyproject.toml
-                call('__version__ = "0.0.1"'),  # __about__.py
+                call(b"mock_pyproject_content"),  # pyproject.toml
+                call(b'__version__ = "0.0.1"'),  # __about__.py
+                call(WORKFLOW_MAC_BYTES),
+                call(WORKFLOW_UBUNTU_BYTES),
             ],
             any_order=True,
         )
 
-        # Check if __init__.py was touched
-        assert mock_touch.call_count == 7
+        # Files are created by the writes themselves
+        mock_write_text.assert_not_called()
+        mock_touch.assert_not_called()
 
         # Check if create_pyproject_toml was called with correct arguments
         mock_create_pyproject.assert_called_once_with(project_name, author, description, deps, python_version="3.11", add_cli=True)
 
 
 def test_create_project_with_local_deps(mock_cwd):
-    with (
-        patch("pyproject_pip.create.Path.mkdir"),
-        patch("pyproject_pip.create.Path.write_text"),
-        patch("pyproject_pip.create.Path.touch"),
-        patch("pyproject_pip.create.create_pyproject_toml") as mock_create_pyproject,
-    ):
+    with patch_path(), patch("pyproject_pip.create.create_pyproject_toml") as mock_create_pyproject:
         create_project(
             "local_project",
             "Local Author",
@@ -70,12 +78,7 @@ def test_create_project_with_local_deps(mock_cwd):
 
 
 def test_create_project_no_deps(mock_cwd):
-    with (
-        patch("pyproject_pip.create.Path.mkdir"),
-        patch("pyproject_pip.create.Path.write_text"),
-        patch("pyproject_pip.create.Path.touch"),
-        patch("pyproject_pip.create.create_pyproject_toml") as mock_create_pyproject,
-    ):
+    with patch_path(), patch("pyproject_pip.create.create_pyproject_toml") as mock_create_pyproject:
         create_project("no_deps_project", "No Deps Author")
         mock_create_pyproject.assert_called_once_with(
             "no_deps_project",
@@ -88,13 +91,21 @@ def test_create_project_no_deps(mock_cwd):
 
 
 def test_create_project_existing_directory(mock_cwd):
-    with (
-        patch("pyproject_pip.create.Path.mkdir") as mock_mkdir,
-        patch("pyproject_pip.create.Path.write_text"),
-        patch("pyproject_pip.create.Path.touch"),
-    ):
+    with patch_path() as mocks:
         create_project("existing_project", "Existing Author")
 
         # All mkdir calls should have exist_ok=True
-        for call in mock_mkdir.call_args_list:
+        for call in mocks["mkdir"].call_args_list:
             assert call[1].get("exist_ok", False) is True
+
+
+def test_create_pyproject_toml_python_version():
+    content = create_pyproject_toml("project", "Author", python_version=">=3.11")
+    assert 'requires-python = ">=3.11"' in content
+    assert '"Programming Language :: Python :: 3.12",' in content
+    assert '"Programming Language :: Python :: 3.10",' not in content
+
+    with pytest.raises(ValueError, match="Invalid Python version"):
+        create_pyproject_toml("project", "Author", python_version="3")
+    with pytest.raises(ValueError, match="Invalid Python version"):
+        create_pyproject_toml("project", "Author", python_version="3.x")
@@ -1,25 +1,188 @@
 import pytest
+import requests
+from pyproject_pip import pypip
 from pyproject_pip.pypip import (
     get_latest_version,
+    get_package_info,
     base_name,
+    clean_text,
     modify_dependencies,
-    is_group,
-    process_dependencies,
     search_package,
     find_and_sort,
+    get_package_names,
+    get_pip_freeze,
+    is_package_in_pyproject,
+    is_bare_requirement,
+    is_package_in_requirements,
+    load_pyproject,
+    modify_pyproject_toml_bulk,
+    modify_requirements_bulk,
+    read_pip_report,
+    read_project_dependencies,
 )
 
 
-def test_get_latest_version():
-    assert get_latest_version("pytest") is not None
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", text="", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Client Error")
+
+
+class FakePyPI:
+    """Stands in for the shared session's get: answers from `responses` by URL and records every request."""
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers))
+        response = self.responses.get(url, FakeResponse(404))
+        return response(headers) if callable(response) else response
+
+
+def pypi_json(package_name):
+    return f"https://pypi.org/pypi/{package_name}/json"
+
+
+@pytest.fixture
+def fake_pypi(monkeypatch):
+    pypi = FakePyPI()
+    monkeypatch.setattr(pypip.get_session(), "get", pypi.get)
+    monkeypatch.setattr("pyproject_pip.pypip._version_cache", {})
+    pypip.clear_caches()
+    yield pypi
+    pypip.clear_caches()
+
+
+def test_get_latest_version(fake_pypi):
+    fake_pypi.responses[pypi_json("pytest")] = FakeResponse(
+        content=b'{"info": {"version": "8.0.0"}, "releases": {"8.0.0": []}}'
+    )
+    assert get_latest_version("pytest") == "8.0.0"
     # Test with a non-existent package
     assert get_latest_version("non_existent_package_12345") is None
 
 
+def test_get_latest_version_cache(fake_pypi):
+    content = b'{"releases": {"1.0.0": [], "2.0.0": [], "2.0.0.post1": [], "2.1.0rc1": [], "not-a-version": []}}'
+    fake_pypi.responses[pypi_json("cached_package")] = lambda headers: FakeResponse(
+        304 if headers else 200, content, headers={"ETag": '"etag-1"'}
+    )
+    assert get_latest_version("cached_package") == "2.0.0.post1"
+    assert get_latest_version("cached_package") == "2.0.0.post1"
+    assert [headers for _, headers in fake_pypi.requests] == [{}]
+
+    # Once the entry is stale it is revalidated with its ETag instead of downloaded again.
+    pypip._fetch_latest_version.cache_clear()
+    pypip._version_cache["cached_package"]["ts"] = 0
+    assert get_latest_version("cached_package") == "2.0.0.post1"
+    assert [headers for _, headers in fake_pypi.requests] == [{}, {"If-None-Match": '"etag-1"'}]
+
+
+def test_get_latest_version_does_not_cache_failures(fake_pypi):
+    fake_pypi.responses[pypi_json("flaky")] = FakeResponse(503)
+    assert get_latest_version("flaky") is None
+    fake_pypi.responses[pypi_json("flaky")] = FakeResponse(content=b'{"info": {"version": "1.0.0"}}')
+    assert get_latest_version("flaky") == "1.0.0"
+
+    # A stale entry is returned when it cannot be revalidated.
+    pypip.clear_caches()
+    pypip._version_cache["flaky"]["ts"] = 0
+    fake_pypi.responses[pypi_json("flaky")] = FakeResponse(503)
+    assert get_latest_version("flaky") == "1.0.0"
+
+
+def test_get_latest_version_info(fake_pypi):
+    fake_pypi.responses[pypi_json("info_package")] = FakeResponse(
+        content=b'{"info": {"version": "1.5.0"}, "releases": {"1.5.0": [], "1.0.0": []}}'
+    )
+    assert get_latest_version("info_package") == "1.5.0"
+
+
+@pytest.mark.parametrize(
+    "content",
+    ['{"requests": {"version": "1.0"}, "click": {"version": "8.0", "etag": null, "ts": 0}}', '["requests"]', "{"],
+)
+def test_load_version_cache_drops_malformed_entries(tmp_path, monkeypatch, content):
+    cache_path = tmp_path / "versions.json"
+    cache_path.write_text(content)
+    monkeypatch.setattr("pyproject_pip.pypip._VERSION_CACHE_PATH", cache_path)
+    monkeypatch.setattr("pyproject_pip.pypip._version_cache", None)
+    expected = {"click": {"version": "8.0", "etag": None, "ts": 0}} if content.startswith("{\"") else {}
+    assert pypip._load_version_cache() == expected
+
+
+def test_pypi_lookups_do_not_cache_failures_or_share_results(fake_pypi):
+    content = b'{"info": {"name": "demo", "summary": "Demo", "project_urls": {"Source": "https://github.com/a/demo"}}}'
+    fake_pypi.responses[pypi_json("demo")] = FakeResponse(503)
+    assert search_package("demo") == {}
+
+    fake_pypi.responses[pypi_json("demo")] = FakeResponse(content=content)
+    assert search_package("demo")["github_url"] == "https://github.com/a/demo"
+    package_info = get_package_info("demo")
+    package_info["urls"]["Source"] = "changed"
+    package_info["name"] = "changed"
+    assert get_package_info("demo")["name"] == "demo"
+    assert get_package_info("demo")["urls"] == {"Source": "https://github.com/a/demo"}
+    assert len(fake_pypi.requests) == 2
+
+
+def test_get_package_names(fake_pypi):
+    fake_pypi.responses["https://pypi.org/search/?q=package"] = FakeResponse(
+        text=(
+            '<a class="package-snippet" href="/a/"><span class="package-snippet__name">package1</span></a>'
+            '<a class="package-snippet" href="/b/"><span>no name</span></a>'
+            '<a class="package-snippet" href="/c/">\n  <span class="package-snippet__name">package2</span>\n</a>'
+        )
+    )
+    assert get_package_names("package") == ["package1", "package2"]
+
+
 def test_base_name():
     assert base_name("package") == "package"
     assert base_name("package[extra]") == "package"
     assert base_name("package==1.0.0") == "package"
+    assert base_name("package>=1.0") == "package"
+    assert base_name("package; python_version < '3.11'") == "package"
+    assert base_name("git+https://github.com/a/b.git") == "git+https://github.com/a/b.git"
+    assert base_name("src/mypkg") == "src/mypkg"
+
+
+def test_is_bare_requirement():
+    assert is_bare_requirement("package")
+    assert is_bare_requirement("package[extra]")
+    assert is_bare_requirement("package ")
+    assert not is_bare_requirement("package>=1.0")
+    assert not is_bare_requirement("package; python_version < '3.11'")
+    assert not is_bare_requirement("git+https://github.com/a/b.git")
+
+
+def test_clean_text():
+    text = "# Title\n\nSome *em*, **bold** and [a link](https://x.y) with `code`\n\n```bash\npip install demo\n```\n"
+    assert clean_text(text) == "Title\n\nSome em, bold and a link with code\n\npip install demo"
+    assert clean_text('<p align="center">snake_case_name</p>\n.. image:: logo.png') == "snake_case_name"
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Call `__init__` ok", "Call __init__ ok"),
+        ("Use `f(*args, **kwargs) or 2*3*4` here", "Use f(*args, **kwargs) or 2*3*4 here"),
+        (
+            "```python\n# not a heading\nf(**kwargs)  # [x](y)\n```\n*done*",
+            "# not a heading\nf(**kwargs)  # [x](y)\ndone",
+        ),
+    ],
+)
+def test_clean_text_keeps_code(text, expected):
+    assert clean_text(text) == expected
 
 
 def test_modify_dependencies():
@@ -36,52 +199,147 @@ def test_modify_dependencies():
     assert len(result) == 1
 
 
-def test_is_group():
-    assert is_group("[group]") is True
-    assert is_group("not_a_group") is False
-    assert is_group('[group with "quotes"]') is False
+def test_modify_pyproject_toml_bulk(tmp_path):
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_text(
+        '# comment kept\n[project]\nname = "demo"\ndependencies = ["package1==1.0.0", "package2"]\n'
+    )
+    modify_pyproject_toml_bulk(
+        [("package2", "2.0.0"), ("package3[extra]", None)],
+        pyproject_path=pyproject_path,
+    )
+    assert pyproject_path.read_text() == (
+        '# comment kept\n[project]\nname = "demo"\ndependencies = [\n'
+        '    "package1==1.0.0",\n    "package2==2.0.0",\n    "package3[extra]",\n]\n'
+    )
+
+    assert [path.name for path in tmp_path.iterdir()] == ["pyproject.toml"]
+
+    modify_pyproject_toml_bulk([("package1", None)], action="uninstall", pyproject_path=pyproject_path)
+    assert load_pyproject(pyproject_path)["project"]["dependencies"] == ["package2==2.0.0", "package3[extra]"]
+
+
+def test_modify_pyproject_toml_bulk_optional_group(tmp_path):
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_text(
+        '[project]\nname = "demo"\n[project.optional-dependencies]\ndev = ["package1"]\nall = ["package1", "extra1"]\n'
+    )
+    modify_pyproject_toml_bulk(
+        [("package2", "2.0.0"), ("package1", "1.0.0")],
+        dependency_group="dev",
+        pyproject_path=pyproject_path,
+    )
+    optional = load_pyproject(pyproject_path)["project"]["optional-dependencies"]
+    assert optional["dev"] == ["package1==1.0.0", "package2==2.0.0"]
+    assert optional["all"] == ["extra1", "package1==1.0.0", "package2==2.0.0"]
+
+    modify_pyproject_toml_bulk([("package1", None)], action="uninstall", dependency_group="dev", pyproject_path=pyproject_path)
+    optional = load_pyproject(pyproject_path)["project"]["optional-dependencies"]
+    assert optional["dev"] == ["package2==2.0.0"]
+    assert optional["all"] == ["extra1", "package2==2.0.0"]
+
+
+def test_modify_pyproject_toml_bulk_keeps_crlf(tmp_path):
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_bytes(b'[project]\r\nname = "demo"\r\ndependencies = ["package1"]\r\n')
+    modify_pyproject_toml_bulk([("package2", None)], pyproject_path=pyproject_path)
+    assert pyproject_path.read_bytes() == (
+        b'[project]\r\nname = "demo"\r\ndependencies = [\r\n    "package1",\r\n    "package2",\r\n]\r\n'
+    )
+
+
+def test_write_pyproject_keeps_symlink_and_mode(tmp_path):
+    target = tmp_path / "real.toml"
+    target.write_text('[project]\nname = "demo"\ndependencies = []\n')
+    target.chmod(0o640)
+    link = tmp_path / "pyproject.toml"
+    link.symlink_to(target)
+
+    modify_pyproject_toml_bulk([("package1", None)], pyproject_path=link)
+    assert link.is_symlink()
+    assert load_pyproject(target)["project"]["dependencies"] == ["package1"]
+    assert target.stat().st_mode & 0o777 == 0o640
+
+
+def test_load_pyproject_cache(tmp_path):
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_text('[project]\ndependencies = ["package1"]\n')
+    first = load_pyproject(pyproject_path)
+    assert load_pyproject(pyproject_path) is first
+
+    pyproject_path.write_text('[project]\ndependencies = ["package1", "package2"]\n')
+    reloaded = load_pyproject(pyproject_path)
+    assert reloaded is not first
+    assert list(reloaded["project"]["dependencies"]) == ["package1", "package2"]
+
+
+def test_is_package_in_pyproject(tmp_path):
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_text(
+        '[project]\ndependencies = ["package1==1.0.0"]\n[tool.hatch.envs.default]\ndependencies = ["pytest"]\n'
+    )
+    assert is_package_in_pyproject("package1", pyproject_path=pyproject_path)
+    assert not is_package_in_pyproject("package", pyproject_path=pyproject_path)
+    assert not is_package_in_pyproject("pytest", pyproject_path=pyproject_path)
+    assert is_package_in_pyproject("pytest", hatch_env="default", pyproject_path=pyproject_path)
+
+
+def test_is_package_in_requirements(tmp_path):
+    requirements_path = tmp_path / "requirements.txt"
+    requirements_path.write_text("package1==1.0.0\npackage2[extra]\n")
+    assert is_package_in_requirements("package1", requirements_path)
+    assert is_package_in_requirements("package2", requirements_path)
+    assert not is_package_in_requirements("package3", requirements_path)
+    assert not is_package_in_requirements("package1", tmp_path / "missing.txt")
+
 
+def test_modify_requirements_bulk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "requirements.txt").write_text("package1==1.0.0\npackage2\n")
 
-def test_process_dependencies():
-    output_lines = []
-    process_dependencies("dep1, dep2, dep3]", output_lines)
-    assert output_lines == ["  dep1,", "  dep2,", "  dep3", "  ]"]
+    modify_requirements_bulk([("package2", "2.0.0"), ("package3[extra]", None)])
+    assert (tmp_path / "requirements.txt").read_text() == "package1==1.0.0\npackage2==2.0.0\npackage3[extra]\n"
 
-    output_lines = []
-    process_dependencies("dep1, dep2, dep3", output_lines)
-    assert output_lines == ["  dep1,", "  dep2,", "  dep3"]
+    modify_requirements_bulk([("package1", None), ("package3", None)], action="uninstall")
+    assert (tmp_path / "requirements.txt").read_text() == "package2==2.0.0\n"
 
-    output_lines = []
-    process_dependencies("dep1[extra1,extra2], dep2, dep3", output_lines)
-    assert output_lines == ["  dep1[extra1,extra2],", "  dep2,", "  dep3"]
 
-    output_lines = []
-    process_dependencies("dep1[extra1,extra2], dep2[extra3], dep3", output_lines)
-    assert output_lines == ["  dep1[extra1,extra2],", "  dep2[extra3", "  ]", "  dep3"]
+def test_modify_requirements_bulk_keeps_marker_and_option_lines(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    lines = "-e ./libs/a\n-e ./libs/b\nfoo; python_version < '3.8'\nfoo>=2; python_version >= '3.8'\n"
+    (tmp_path / "requirements.txt").write_text(lines)
 
+    modify_requirements_bulk([("baz", "1.0")])
+    assert (tmp_path / "requirements.txt").read_text() == lines + "baz==1.0\n"
 
-def test_process_dependencies_multiline():
-    output_lines = []
-    process_dependencies("dep1,\ndep2,\ndep3", output_lines)
-    assert output_lines == ["  dep1,", "  dep2,", "  dep3"]
 
+def test_get_pip_freeze():
+    assert any(package.startswith("pytest==") for package in get_pip_freeze())
 
-def test_process_dependencies_extras_at_end():
-    output_lines = []
-    process_dependencies("dep1, dep2[extra1,extra2]", output_lines)
-    assert output_lines == ["  dep1,", "  dep2[extra1,extra2],"]
 
+def test_read_pip_report(tmp_path):
+    report_path = tmp_path / "report.json"
+    report_path.write_text(
+        '{"install": [{"metadata": {"name": "Package_One", "version": "1.0.0"}},'
+        ' {"metadata": {"name": "package2", "version": "2.0.0"}}]}'
+    )
+    assert read_pip_report(report_path) == {"package-one": "1.0.0", "package2": "2.0.0"}
+    assert read_pip_report(tmp_path / "missing.json") == {}
 
-def test_process_dependencies_remove_extra_quotes():
-    output_lines = []
-    process_dependencies('"dep1", "dep2"', output_lines)
-    assert output_lines == ['  "dep1",', '  "dep2"']
 
+def test_read_project_dependencies(tmp_path):
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_text(
+        '[project]\nname = "demo"\ndynamic = ["version"]\ndependencies = [\n"package1[extra]>=1.0",\n  "package2",\n]\n'
+        '[tool.hatch.envs.default]\ndependencies = ["pytest"]\n'
+    )
+    assert read_project_dependencies(pyproject_path) == ["package1[extra]>=1.0", "package2"]
 
-def test_process_dependencies_trailing_comma():
-    output_lines = []
-    process_dependencies("dep1, dep2,", output_lines)
-    assert output_lines == ["  dep1,", "  dep2,"]
+    # Anything the fast path cannot read safely is left to the full parser.
+    pyproject_path.write_text('[project]\ndependencies = [\n  "package1",  # pinned later\n]\n')
+    assert read_project_dependencies(pyproject_path) is None
+    pyproject_path.write_text('[tool.hatch.envs.default]\ndependencies = ["pytest"]\n')
+    assert read_project_dependencies(pyproject_path) is None
 
 
 def test_search_package():